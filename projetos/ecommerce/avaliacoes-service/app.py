@@ -1,9 +1,57 @@
 # app.py - Microserviço de Avaliações (versão simplificada)
+from collections import defaultdict
 from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
 from datetime import datetime
+import orjson
+
+# Serialização JSON com orjson
+class ORJSONProvider(JSONProvider):
+    """
+    Provider JSON baseado em orjson, usado por todas as chamadas a jsonify
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Mantém o corpo em bytes, evitando a conversão intermediária para str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype='application/json')
+
+# Atalho WSGI para o health check, respondido sem passar pelo despacho do Flask
+class HealthCheckShortcut:
+    """
+    Middleware que responde GET /health com um corpo já serializado
+    """
+    allow = ('Allow', 'GET, HEAD, OPTIONS')
+
+    def __init__(self, wsgi_app, body):
+        self.wsgi_app = wsgi_app
+        self.body = body
+        self.headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))]
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') != '/health':
+            return self.wsgi_app(environ, start_response)
+
+        method = environ.get('REQUEST_METHOD')
+        if method in ('GET', 'HEAD'):
+            start_response('200 OK', self.headers)
+            return [] if method == 'HEAD' else [self.body]
+        if method == 'OPTIONS':
+            start_response('200 OK', [self.allow, ('Content-Length', '0')])
+            return []
+        start_response('405 Method Not Allowed', [self.allow, ('Content-Length', '0')])
+        return []
 
 # Inicialização da aplicação Flask
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Dados de exemplo
 sample_reviews = [
@@ -157,6 +205,35 @@ sample_products = {
     }
 }
 
+# Índices das avaliações por produto e por (produto, status), para filtrar
+# sem varrer todas as avaliações a cada requisição
+def index_reviews(reviews):
+    """
+    Indexa as avaliações por produto e por (produto, status)
+    """
+    by_product = defaultdict(list)
+    by_product_status = defaultdict(list)
+    for item in reviews:
+        by_product[item['product_id']].append(item)
+        by_product_status[(item['product_id'], item['status'])].append(item)
+    return by_product, by_product_status
+
+reviews_by_product, reviews_by_product_status = index_reviews(sample_reviews)
+
+# Respostas ativas agrupadas por avaliação, montadas uma única vez para evitar
+# varrer todas as respostas a cada avaliação listada
+def group_active_responses(responses):
+    """
+    Agrupa as respostas ativas pelo ID da avaliação
+    """
+    grouped = defaultdict(list)
+    for item in responses:
+        if item['status'] == 'active':
+            grouped[item['review_id']].append(item)
+    return grouped
+
+active_responses_by_review = group_active_responses(sample_responses)
+
 # Rotas do microserviço
 
 @app.route('/avaliacoes/produtos/<product_id>', methods=['GET'])
@@ -169,15 +246,15 @@ def get_product_reviews(product_id):
     
     # Filtra as avaliações
     if status == 'all':
-        reviews = [r for r in sample_reviews if r['product_id'] == product_id]
+        reviews = reviews_by_product.get(product_id, [])
     else:
-        reviews = [r for r in sample_reviews if r['product_id'] == product_id and r['status'] == status]
+        reviews = reviews_by_product_status.get((product_id, status), [])
     
     # Para cada avaliação, adiciona suas respostas
     reviews_with_responses = []
     for review in reviews:
         review_data = dict(review)
-        review_data['responses'] = [r for r in sample_responses if r['review_id'] == review['id'] and r['status'] == 'active']
+        review_data['responses'] = active_responses_by_review.get(review['id'], [])
         reviews_with_responses.append(review_data)
     
     return jsonify({
@@ -186,13 +263,9 @@ def get_product_reviews(product_id):
         'product_id': product_id
     })
 
-# Rota para verificar a saúde do serviço
-@app.route('/health', methods=['GET'])
-def health_check():
-    """
-    Endpoint para verificação de saúde do serviço
-    """
-    return jsonify({'status': 'ok', 'service': 'avaliações'})
+# Verificação de saúde do serviço (GET /health), atendida pelo atalho WSGI
+HEALTH_STATUS = {'status': 'ok', 'service': 'avaliações'}
+app.wsgi_app = HealthCheckShortcut(app.wsgi_app, orjson.dumps(HEALTH_STATUS))
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=6001)
\ No newline at end of file
@@ -1,8 +1,52 @@
 # app.py - Microserviço de Categorias (versão simplificada)
-from flask import Flask, jsonify
+from collections import defaultdict
+from functools import lru_cache
+from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+import msgpack
+import orjson
+
+# Serialização JSON com orjson
+class ORJSONProvider(JSONProvider):
+    """
+    Provider JSON baseado em orjson, usado por todas as chamadas a jsonify
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Mantém o corpo em bytes, evitando a conversão intermediária para str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype='application/json')
 
 # Inicialização da aplicação Flask
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Requisições condicionais avaliadas sobre o ETag final da resposta. O
+# Flask-Compress acrescenta ":<algoritmo>" ao ETag das respostas comprimidas sem
+# avaliar o If-None-Match; como os hooks after_request rodam na ordem inversa
+# do registro, este é registrado antes do Compress(app) para rodar depois dele
+@app.after_request
+def evaluate_conditional_request(response):
+    """
+    Responde 304 quando o If-None-Match corresponde ao ETag enviado pela resposta
+    """
+    if 'ETag' in response.headers:
+        return response.make_conditional(request)
+    return response
+
+# Compressão das respostas (Brotli ou gzip) a partir de 500 bytes
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
 
 # Dados de exemplo
 sample_categories = [
@@ -38,6 +82,39 @@ sample_categories = [
     }
 ]
 
+# Árvore de categorias mantida em cache; qualquer alteração em sample_categories
+# deve chamar build_category_hierarchy.cache_clear()
+@lru_cache(maxsize=1)
+def build_category_hierarchy():
+    """
+    Monta a árvore de categorias a partir das categorias raiz
+    """
+    # Monta a árvore em uma única passagem: cada nó já nasce apontando para a
+    # lista de filhos do seu próprio id, preenchida à medida que eles aparecem
+    children = defaultdict(list)
+    for category in sample_categories:
+        children[category['parent_id']].append({
+            'id': category['id'],
+            'name': category['name'],
+            'url_slug': category['url_slug'],
+            'subcategories': children[category['id']]
+        })
+
+    return children[None]
+
+# Negociação de conteúdo: chamadas internas entre serviços podem pedir MessagePack
+def negotiate_response(payload):
+    """
+    Serializa o payload em MessagePack ou JSON conforme o cabeçalho Accept
+    """
+    best = request.accept_mimetypes.best_match(['application/json', 'application/msgpack'])
+    if best == 'application/msgpack':
+        response = app.response_class(msgpack.packb(payload, use_bin_type=True), mimetype='application/msgpack')
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
+
 # Rotas do microserviço
 
 @app.route('/categorias', methods=['GET'])
@@ -47,6 +124,16 @@ def get_all_categories():
     """
     return jsonify(sample_categories)
 
+@app.route('/categorias/hierarquia', methods=['GET'])
+def get_hierarchy():
+    """
+    Retorna a árvore de categorias a partir das categorias raiz
+    """
+    # ETag calculado a partir do corpo; clientes com a versão atual recebem 304
+    response = negotiate_response(build_category_hierarchy())
+    response.add_etag()
+    return response
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
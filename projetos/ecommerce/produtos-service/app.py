@@ -1,8 +1,52 @@
 # app.py - Microserviço de Produtos (versão simplificada)
+from bisect import bisect_right
+from operator import itemgetter
 from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+import msgpack
+import orjson
+
+# Serialização JSON com orjson
+class ORJSONProvider(JSONProvider):
+    """
+    Provider JSON baseado em orjson, usado por todas as chamadas a jsonify
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Mantém o corpo em bytes, evitando a conversão intermediária para str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype='application/json')
 
 # Inicialização da aplicação Flask
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Requisições condicionais avaliadas sobre o ETag final da resposta. O
+# Flask-Compress acrescenta ":<algoritmo>" ao ETag das respostas comprimidas sem
+# avaliar o If-None-Match; como os hooks after_request rodam na ordem inversa
+# do registro, este é registrado antes do Compress(app) para rodar depois dele
+@app.after_request
+def evaluate_conditional_request(response):
+    """
+    Responde 304 quando o If-None-Match corresponde ao ETag enviado pela resposta
+    """
+    if 'ETag' in response.headers:
+        return response.make_conditional(request)
+    return response
+
+# Compressão das respostas (Brotli ou gzip) a partir de 500 bytes
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
 
 # Dados de exemplo
 sample_products = [
@@ -71,33 +115,85 @@ sample_price_history = {
     ]
 }
 
+# Índice dos produtos por ID, para consultas sem varrer a lista inteira
+products_by_id = {product['id']: product for product in sample_products}
+
+# Projeção da listagem de produtos, montada uma única vez com apenas os campos
+# expostos em GET /produtos em vez de reconstruída a cada requisição. A lista
+# fica ordenada por ID para permitir a paginação por cursor
+PRODUCT_LIST_FIELDS = ('id', 'name', 'price', 'stock', 'category_id', 'supplier_id', 'status')
+get_listing_fields = itemgetter(*PRODUCT_LIST_FIELDS)
+product_listing = [
+    dict(zip(PRODUCT_LIST_FIELDS, get_listing_fields(product)))
+    for product in sorted(sample_products, key=itemgetter('id'))
+]
+product_listing_ids = [product['id'] for product in product_listing]
+
+# Negociação de conteúdo: chamadas internas entre serviços podem pedir MessagePack
+def negotiate_response(payload):
+    """
+    Serializa o payload em MessagePack ou JSON conforme o cabeçalho Accept
+    """
+    best = request.accept_mimetypes.best_match(['application/json', 'application/msgpack'])
+    if best == 'application/msgpack':
+        response = app.response_class(msgpack.packb(payload, use_bin_type=True), mimetype='application/msgpack')
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
+
 # Rotas do microserviço
 
 @app.route('/produtos', methods=['GET'])
 def get_all_products():
     """
-    Retorna todos os produtos
+    Retorna uma página de produtos ordenados por ID (padrão 100, máximo 500).
+    Quando há mais produtos, o cabeçalho X-Next-Cursor traz o cursor da
+    próxima página
     """
-    return jsonify([{
-        'id': product['id'],
-        'name': product['name'],
-        'price': product['price'],
-        'stock': product['stock'],
-        'category_id': product['category_id'],
-        'supplier_id': product['supplier_id'],
-        'status': product['status']
-    } for product in sample_products])
+    # Paginação por cursor (keyset): retorna os produtos com ID maior que o
+    # cursor informado, limitados a no máximo 500 por página
+    limit = max(1, min(request.args.get('limit', 100, type=int), 500))
+    cursor = request.args.get('cursor')
+    start = bisect_right(product_listing_ids, cursor) if cursor else 0
+    end = start + limit
+    response = negotiate_response(product_listing[start:end])
+    if end < len(product_listing):
+        response.headers['X-Next-Cursor'] = product_listing_ids[end - 1]
+    return response
 
 @app.route('/produtos/<product_id>', methods=['GET'])
 def get_product(product_id):
     """
     Retorna um produto específico pelo ID
     """
-    product = next((p for p in sample_products if p['id'] == product_id), None)
+    product = products_by_id.get(product_id)
     if product:
-        return jsonify(product)
+        # ETag calculado a partir do corpo; clientes com a versão atual recebem 304
+        response = jsonify(product)
+        response.add_etag()
+        return response
     return jsonify({'error': 'Produto não encontrado'}), 404
 
+@app.route('/produtos/lote', methods=['POST'])
+def get_products_batch():
+    """
+    Retorna vários produtos em uma única chamada, indexados pelo ID
+    """
+    data = request.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not all(isinstance(product_id, str) for product_id in ids):
+        return jsonify({'error': 'Informe a lista de IDs no campo "ids"'}), 400
+    if len(ids) > 500:
+        return jsonify({'error': 'Máximo de 500 IDs por requisição'}), 400
+
+    # IDs inexistentes são omitidos da resposta
+    return jsonify({
+        product_id: products_by_id[product_id]
+        for product_id in ids
+        if product_id in products_by_id
+    })
+
 # Rota para verificar a saúde do serviço
 @app.route('/health', methods=['GET'])
 def health_check():